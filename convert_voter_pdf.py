@@ -1,75 +1,226 @@
 import pdfplumber
-import pandas as pd
+import csv
+import io
 import re
 import logging
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict
+from typing import Iterator, List, Tuple
+
+# Optional: PyMuPDF (C-backed) extracts text many times faster than pdfplumber
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
 
 # ====================== LOGGING ======================
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("pdf_to_csv.log", mode="w", encoding="utf-8"),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Configured from __main__ only: bulk-mode worker processes re-import this
+# module and must not truncate the parent's log file
+def setup_logging():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.FileHandler("pdf_to_csv.log", mode="w", encoding="utf-8"),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
 logger = logging.getLogger(__name__)
 
+# Worker processes: bulk mode converts this many PDFs at once (one per process);
+# single-file mode uses the same number to extract pages in parallel
+MAX_WORKERS = min(os.cpu_count() or 1, 4)
+
+# Single-file mode hands pages to worker processes in batches of this size
+PAGE_BATCH = 25
+
+# Progress is printed every PROGRESS_PAGES pages, or sooner if PROGRESS_SECONDS pass
+PROGRESS_PAGES = 50
+PROGRESS_SECONDS = 5.0
+
+# ====================== PATTERNS ======================
+# Compiled once at import — parse_voter_line runs on every line of every page.
+# Stdlib re on purpose: lines are short, and google-re2's per-call str → UTF-8
+# conversion made it ~5x slower than re on these patterns
+
+# Candidate lines: a leading digit and at least 15 characters — anything else can't
+# be a record. Run over a whole page so discarded lines never become Python strings
+_CANDIDATE_RE = re.compile(r'^[^\S\n]*\d.{14,}', re.MULTILINE)
+
+# Pattern 1: ALL Check-in reports (Medina minimal, Medina/Kerr/Gillespie with polling place)
+# Polling Place is now OPTIONAL — precinct is always at the END
+_PAT1 = re.compile(r'^(\d{1,4})\s+(.+?)\s+(\d{9,12})\s*(.+?)?\s+([SP]\s+[\w\.\-]+)\s*(.+)?$')
+
+# Brazos reports lead every row with the election name (Patterns 2 and 3)
+_ELECTION_PREFIX = "2026 REPUBLICAN PRIMARY "
+
+# Pattern 2: Mailed Ballots (Brazos)
+_PAT2 = re.compile(r'^(2026 REPUBLICAN PRIMARY)\s+(\d{1,3})\s+(\d{9,12})\s+(.+)$')
+
+# Pattern 3: Personal Appearance (Brazos)
+_PAT3 = re.compile(r'^(2026 REPUBLICAN PRIMARY)\s+(.+?)\s+(\d{9,12})\s+(\d{1,3})$')
+
+# ====================== OUTPUT COLUMNS ======================
+CHECKIN_COLUMNS = ("No", "Name", "State ID", "Polling Place", "Precinct", "Voter Guid")
+MAILED_COLUMNS = ("Election", "Pct", "State ID", "Name")
+APPEARANCE_COLUMNS = ("Election", "Name", "State ID", "Precinct")
+
+# State ID is the third value in every layout above
+STATE_ID_INDEX = 2
+
 # ====================== UNIVERSAL PARSER ======================
-def parse_voter_line(line: str) -> Dict[str, str] | None:
-    # Normalize whitespace (fixes pdfplumber quirks)
-    line = re.sub(r'\s+', ' ', line.strip())
-    if not line or len(line) < 15:
+def parse_voter_line(line: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]] | None:
+    """Return (columns, values) for a voter row, or None for anything else."""
+    # Strip and normalize whitespace in one pass (fixes pdfplumber quirks)
+    line = " ".join(line.split())
+    # Every record starts with a digit (row number or election year) — this
+    # rejects headers, footers and blank tails without touching the regex engine
+    if len(line) < 15 or not line[0].isdigit():
         return None
 
-    # Skip any line that STARTS with a header (covers ALL formats + repeating page headers)
-    header_start = r'^(No\.|Name|State ID|Polling Place|Precinct|Voter Guid|County Name|Election Name|Report|ePulse|From|To|Voter Check-in|SELECTED ELECTION|VOTED BY PERSONAL APPEARANCE|MAILED BALLOTS|Website Post Report)'
-    if re.match(header_start, line, re.IGNORECASE):
+    if line.startswith(_ELECTION_PREFIX):
+        # Pattern 2: Mailed Ballots (Brazos)
+        m = _PAT2.match(line)
+        if m:
+            election, pct, state_id, name = m.groups()
+            return MAILED_COLUMNS, (election, pct, state_id, name.strip())
+
+        # Pattern 3: Personal Appearance (Brazos)
+        m = _PAT3.match(line)
+        if m:
+            election, name, state_id, precinct = m.groups()
+            return APPEARANCE_COLUMNS, (election, name.strip(), state_id, precinct)
+
         return None
 
-    # Pattern 1: ALL Check-in reports (Medina minimal, Medina/Kerr/Gillespie with polling place)
-    # Polling Place is now OPTIONAL — precinct is always at the END
-    m = re.search(
-        r'^(\d{1,4})\s+(.+?)\s+(\d{9,12})\s*(.+?)?\s+([SP]\s+[\w\.\-]+)\s*(.+)?$',
-        line
-    )
-    if m:
-        polling = m.group(4).strip() if m.group(4) and m.group(4).strip() else ""
-        return {
-            "No": m.group(1),
-            "Name": m.group(2),
-            "State ID": m.group(3),
-            "Polling Place": polling,
-            "Precinct": m.group(5),
-            "Voter Guid": m.group(6).strip() if m.group(6) else ""
-        }
-
-    # Pattern 2: Mailed Ballots (Brazos)
-    m = re.search(r'^(2026 REPUBLICAN PRIMARY)\s+(\d{1,3})\s+(\d{9,12})\s+(.+)$', line)
-    if m:
-        return {
-            "Election": m.group(1).strip(),
-            "Pct": m.group(2).strip(),
-            "State ID": m.group(3).strip(),
-            "Name": m.group(4).strip()
-        }
-
-    # Pattern 3: Personal Appearance (Brazos)
-    m = re.search(r'^(2026 REPUBLICAN PRIMARY)\s+(.+?)\s+(\d{9,12})\s+(\d{1,3})$', line)
+    # Pattern 1: Check-in reports
+    m = _PAT1.match(line)
     if m:
-        return {
-            "Election": m.group(1).strip(),
-            "Name": m.group(2).strip(),
-            "State ID": m.group(3).strip(),
-            "Precinct": m.group(4).strip()
-        }
+        no, name, state_id, polling, precinct, guid = m.groups()
+        return CHECKIN_COLUMNS, (no, name, state_id, (polling or "").strip(), precinct, (guid or "").strip())
 
     return None
 
+# ====================== TEXT EXTRACTION ======================
+# Text within this many points vertically belongs to the same row
+Y_TOLERANCE = 2
+
+def _mupdf_page_text(page) -> str:
+    # get_text("text") emits table cells one per line, so rebuild the visual rows:
+    # cluster text spans by baseline, then join each row left to right. Baselines,
+    # not box tops — cells on one row can mix fonts/sizes, whose ascenders differ
+    spans = [
+        span
+        for block in page.get_text("dict")["blocks"]
+        for line in block.get("lines", ())
+        for span in line["spans"]
+    ]
+    spans.sort(key=lambda span: span["origin"][1])
+    rows: List[list] = []
+    last_baseline = None
+    for span in spans:
+        baseline = span["origin"][1]
+        if last_baseline is None or baseline - last_baseline > Y_TOLERANCE:
+            rows.append([])
+        rows[-1].append(span)
+        last_baseline = baseline
+    return "\n".join(
+        " ".join(span["text"] for span in sorted(row, key=lambda span: span["origin"][0]))
+        for row in rows
+    )
+
+def _open_pdf(pdf_path: str):
+    """Open with PyMuPDF when installed, otherwise pdfplumber."""
+    if pymupdf:
+        return pymupdf.open(pdf_path)
+    # pdfminer does a couple of small seek+reads per page; read the file in one go
+    # so those become memory reads (matters most on network shares)
+    return pdfplumber.open(io.BytesIO(Path(pdf_path).read_bytes()))
+
+def _pages(pdf):
+    return pdf if pymupdf else pdf.pages
+
+def _page_text(page) -> str:
+    if pymupdf:
+        return _mupdf_page_text(page)
+    # extract_text_simple skips the word-extraction pass extract_text builds its
+    # layout from; it only differs in runs of spaces, which the parser collapses.
+    # pdfplumber < 0.8 doesn't have it, so fall back to extract_text there
+    extract = getattr(page, "extract_text_simple", page.extract_text)
+    text = extract(x_tolerance=2, y_tolerance=Y_TOLERANCE) or ""
+    # pdfplumber keeps every page's parsed chars until the PDF is closed; drop them
+    # now so memory stays flat on 1000+ page files (flush_cache, not close(), which
+    # only exists from pdfplumber 0.10.4)
+    page.flush_cache()
+    return text
+
+# Each page-extraction worker opens the PDF once and keeps it for every batch
+_worker_pdf = None
+
+def _open_worker_pdf(pdf_path: str):
+    global _worker_pdf
+    _worker_pdf = _open_pdf(pdf_path)
+
+def _extract_pages_text(start: int, stop: int) -> List[str]:
+    """Extract text from pages [start, stop) — runs inside a worker process."""
+    pages = _pages(_worker_pdf)
+    return [_page_text(pages[i]) for i in range(start, stop)]
+
+def iter_page_text(pdf_path: Path, workers: int = 1) -> Iterator[Tuple[int, int, str]]:
+    """Yield (page_num, total_pages, text) for every page, in page order.
+
+    With workers > 1 and the pdfplumber backend, text extraction (the slow
+    part) is spread across that many processes in batches of PAGE_BATCH pages.
+    PyMuPDF extracts a page in about a millisecond, far less than it costs to
+    start a worker, so it always runs in-process.
+    """
+    with _open_pdf(str(pdf_path)) as pdf:
+        pages = _pages(pdf)
+        total_pages = len(pages)
+        if workers <= 1 or pymupdf or total_pages <= PAGE_BATCH:
+            for page_num, page in enumerate(pages, 1):
+                yield page_num, total_pages, _page_text(page)
+            return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_open_worker_pdf, initargs=(str(pdf_path),)) as ex:
+        futures = [
+            ex.submit(_extract_pages_text, start, min(start + PAGE_BATCH, total_pages))
+            for start in range(0, total_pages, PAGE_BATCH)
+        ]
+        page_num = 0
+        for fut in futures:
+            for text in fut.result():
+                page_num += 1
+                yield page_num, total_pages, text
+
 # ====================== CONVERSION ======================
-def convert_single_pdf(pdf_path: Path, output_csv: Path | None = None) -> int:
+def _merge_layouts(part_csv: Path, header: Tuple[str, ...], extra: List[Tuple[Tuple[str, ...], Tuple[str, ...]]]):
+    """Rewrite part_csv with the union of every layout's columns.
+
+    Only reached when one PDF mixes report layouts: the rows already streamed
+    under the first layout's header are read back and padded alongside the rest.
+    """
+    columns = list(header)
+    for cols, _ in extra:
+        columns += [c for c in cols if c not in columns]
+
+    def pad(cols, values):
+        row = dict(zip(cols, values))
+        return [row.get(c, "") for c in columns]
+
+    with open(part_csv, newline="", encoding="utf-8") as f:
+        streamed = list(csv.reader(f))[1:]
+    with open(part_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(columns)
+        writer.writerows(pad(header, values) for values in streamed)
+        writer.writerows(pad(cols, values) for cols, values in extra)
+
+def convert_single_pdf(pdf_path: Path, output_csv: Path | None = None, workers: int = 1) -> int:
     if not pdf_path.exists():
         print(f"❌ PDF not found: {pdf_path}")
         return 0
@@ -78,37 +229,74 @@ def convert_single_pdf(pdf_path: Path, output_csv: Path | None = None) -> int:
         output_csv = pdf_path.with_name(f"{pdf_path.stem}_converted.csv")
 
     print(f"Processing: {pdf_path.name}")
-    records: List[Dict[str, str]] = []
+    # Rows are streamed to a .part file and renamed once the whole PDF is read,
+    # so a failed or empty conversion never leaves a half-written CSV behind
+    part_csv = output_csv.with_name(output_csv.name + ".part")
+    header: Tuple[str, ...] | None = None
+    # Rows from a second layout (and everything after them) wait for _merge_layouts
+    extra: List[Tuple[Tuple[str, ...], Tuple[str, ...]]] = []
+    n_records = 0
+    # Duplicate State IDs are dropped as they are read (first occurrence wins)
+    seen: set[str] = set()
+    n_duplicates = 0
+    next_progress = time.monotonic() + PROGRESS_SECONDS
 
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page_num, page in enumerate(pdf.pages, 1):
-                text = page.extract_text(x_tolerance=2, y_tolerance=2)
-                if not text:
-                    continue
-                lines = [ln.strip() for ln in text.split("\n") if ln.strip()]
-                for line in lines:
-                    parsed = parse_voter_line(line)
+        with open(part_csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            # Rows are written a page at a time with one writerows call
+            page_rows: List[Tuple[str, ...]] = []
+            # Local names for the per-line calls (LOAD_FAST instead of global/attribute lookups)
+            candidates = _CANDIDATE_RE.findall
+            parse = parse_voter_line
+            add_row = page_rows.append
+            for page_num, total_pages, text in iter_page_text(pdf_path, workers):
+                for line in candidates(text):
+                    parsed = parse(line)
                     if parsed:
-                        records.append(parsed)
+                        columns, values = parsed
+                        state_id = values[STATE_ID_INDEX]
+                        if state_id in seen:
+                            n_duplicates += 1
+                            continue
+                        seen.add(state_id)
+                        if header is None:
+                            header = columns
+                            writer.writerow(header)
+                        if columns is header and not extra:
+                            add_row(values)
+                        else:
+                            extra.append((columns, values))
+                        n_records += 1
+                writer.writerows(page_rows)
+                page_rows.clear()
 
-                if page_num % 10 == 0 or page_num == len(pdf.pages):
-                    print(f"   → Page {page_num}/{len(pdf.pages)}  ({len(records)} records)")
+                if page_num % PROGRESS_PAGES == 0 or page_num == total_pages or time.monotonic() >= next_progress:
+                    print(f"   → {pdf_path.name}: page {page_num}/{total_pages}  ({n_records} records)")
+                    next_progress = time.monotonic() + PROGRESS_SECONDS
+
+        if extra:
+            _merge_layouts(part_csv, header, extra)
 
     except Exception as e:
+        part_csv.unlink(missing_ok=True)
         print(f"❌ Error reading {pdf_path.name}: {e}")
         return 0
+    except BaseException:
+        # Ctrl+C (KeyboardInterrupt) — still don't leave a half-written CSV behind
+        part_csv.unlink(missing_ok=True)
+        raise
 
-    if not records:
+    if not n_records:
+        part_csv.unlink(missing_ok=True)
         print(f"⚠️ No records found in {pdf_path.name}")
         return 0
 
-    df = pd.DataFrame(records)
-    df = df.drop_duplicates(subset=["State ID"], keep="first")
-
-    df.to_csv(output_csv, index=False, encoding="utf-8")
-    print(f"✅ Saved {len(df)} records → {output_csv.name}\n")
-    return len(df)
+    os.replace(part_csv, output_csv)
+    if n_duplicates:
+        print(f"   → {pdf_path.name}: skipped {n_duplicates} duplicate State IDs")
+    print(f"✅ Saved {n_records} records → {output_csv.name}\n")
+    return n_records
 
 # ====================== MENU ======================
 def main():
@@ -132,7 +320,7 @@ def main():
             default_out = pdf_path.with_name(f"{pdf_path.stem}_converted.csv")
             out_name = input(f"Output name (Enter for default): ").strip()
             out_path = Path(out_name) if out_name else default_out
-            convert_single_pdf(pdf_path, out_path)
+            convert_single_pdf(pdf_path, out_path, workers=MAX_WORKERS)
 
         elif choice == "2":
             folder_str = input("\nDrag & drop folder or paste path: ").strip().strip('"\'')
@@ -140,15 +328,20 @@ def main():
             if not folder.is_dir():
                 print("❌ Folder not found")
                 continue
-            pdfs = list(folder.glob("*.pdf")) + list(folder.glob("*.PDF"))
+            # set() — on case-insensitive filesystems both globs return the same files
+            pdfs = sorted(set(folder.glob("*.pdf")) | set(folder.glob("*.PDF")))
             if not pdfs:
                 print("❌ No PDFs found")
                 continue
             print(f"\nFound {len(pdfs)} PDFs – starting bulk conversion...\n")
             total = 0
-            for p in pdfs:
-                out = p.with_name(f"{p.stem}_converted.csv")
-                total += convert_single_pdf(p, out)
+            with ProcessPoolExecutor(max_workers=min(MAX_WORKERS, len(pdfs))) as ex:
+                futures = {
+                    ex.submit(convert_single_pdf, p, p.with_name(f"{p.stem}_converted.csv")): p
+                    for p in pdfs
+                }
+                for fut in as_completed(futures):
+                    total += fut.result()
             print(f"\n🎉 FINISHED! Total records across all files: {total}")
 
         elif choice == "3":
@@ -158,6 +351,7 @@ def main():
             print("Please enter 1, 2, or 3")
 
 if __name__ == "__main__":
+    setup_logging()
     try:
         main()
     except KeyboardInterrupt:
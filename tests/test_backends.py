@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import convert_voter_pdf  # noqa: E402
+
+pytest.importorskip("pymupdf")
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_mixed_font_rows_match_across_backends(tmp_path, monkeypatch):
+    # Check-in rows whose cells mix fonts and sizes (Helvetica-Bold 10 / Helvetica 8,
+    # Courier 9 / Helvetica-Bold 11, ...) on a shared baseline
+    pdf = FIXTURES / "mixed_fonts.pdf"
+
+    mupdf_csv = tmp_path / "mupdf.csv"
+    assert convert_voter_pdf.convert_single_pdf(pdf, mupdf_csv) == 4
+
+    monkeypatch.setattr(convert_voter_pdf, "pymupdf", None)
+    plumber_csv = tmp_path / "pdfplumber.csv"
+    assert convert_voter_pdf.convert_single_pdf(pdf, plumber_csv) == 4
+
+    assert mupdf_csv.read_text(encoding="utf-8") == plumber_csv.read_text(encoding="utf-8")